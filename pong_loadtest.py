@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import json
+
+from pong_server import DIFFICULTIES, TICK_INTERVAL, PongServer, percentile
+
+
+class BotStats:
+    def __init__(self):
+        self.connected = 0
+        self.failed = 0
+        self.states = 0
+        self.matches = 0
+
+
+async def bot_player(host, port, difficulty, duration, stats):
+    # Topu takip eden basit simüle oyuncu
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.failed += 1
+        return
+    stats.connected += 1
+    writer.write(f"JOIN {difficulty}\n".encode())
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    role = None
+    paddle_width = 3
+    try:
+        while loop.time() < deadline:
+            try:
+                line = await asyncio.wait_for(reader.readline(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            parts = line.decode().split()
+            if parts[0] == "ROOM":
+                role = parts[2]
+                paddle_width = int(parts[3].split(",")[2])
+                stats.matches += 1
+            elif parts[0] == "S" and role:
+                stats.states += 1
+                fields = [int(v) for v in parts[1].split(",")]
+                ball_x = fields[1]
+                paddle = fields[3] if role == "TOP" else fields[4]
+                center = paddle + paddle_width // 2
+                if ball_x < center:
+                    writer.write(b"L\n")
+                elif ball_x > center:
+                    writer.write(b"R\n")
+            elif parts[0] == "END":
+                # Rakip gittiyse yeniden eşleş
+                role = None
+                writer.write(f"JOIN {difficulty}\n".encode())
+        writer.write(b"QUIT\n")
+        await writer.drain()
+    except (ConnectionError, ValueError, IndexError):
+        pass
+    finally:
+        writer.close()
+
+
+async def bot_spectator(host, port, duration, stats):
+    # Odalar kurulsun diye biraz bekle, sonra rastgele bir maçı izle
+    await asyncio.sleep(min(1.0, duration / 4))
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        stats.failed += 1
+        return
+    stats.connected += 1
+    writer.write(b"WATCH\n")
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    try:
+        while loop.time() < deadline:
+            try:
+                line = await asyncio.wait_for(reader.readline(), deadline - loop.time())
+            except asyncio.TimeoutError:
+                break
+            if not line:
+                break
+            if line.startswith(b"S "):
+                stats.states += 1
+            elif line.startswith((b"END", b"ERR")):
+                writer.write(b"WATCH\n")
+                await asyncio.sleep(0.2)
+        writer.write(b"QUIT\n")
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_load_test(args):
+    server = PongServer("127.0.0.1", args.port, args.tick, args.phone_size)
+    port = await server.start()
+    stats = BotStats()
+
+    difficulties = [d.upper() for d in args.difficulty] if args.difficulty else list(DIFFICULTIES)
+    bots = []
+    for i in range(args.clients):
+        difficulty = difficulties[i % len(difficulties)]
+        bots.append(bot_player("127.0.0.1", port, difficulty, args.duration, stats))
+    for _ in range(args.spectators):
+        bots.append(bot_spectator("127.0.0.1", port, args.duration, stats))
+
+    print(f"{args.clients} oyuncu + {args.spectators} izleyici, {args.duration:.0f} sn çalışıyor...")
+    await asyncio.gather(*bots)
+    await asyncio.sleep(args.tick * 2)
+    await server.close()
+    return server.stats(), stats
+
+
+def print_report(room_stats, stats, top):
+    print(f"\nBağlantı: {stats.connected} başarılı, {stats.failed} başarısız")
+    print(f"Eşleşme: {stats.matches} | Alınan durum mesajı: {stats.states}")
+    print(f"Oda sayısı: {len(room_stats)}")
+    if not room_stats:
+        return
+
+    def summary(key):
+        values = [room[key] for room in room_stats]
+        return (sum(values) / len(values), percentile(values, 50),
+                percentile(values, 99), max(values))
+
+    print(f"\n{'ÖLÇÜM':<22}{'ORT':>10}{'P50':>10}{'P99':>10}{'MAKS':>10}")
+    for key, label in (("jitter_avg_ms", "Jitter ort (ms)"),
+                       ("jitter_p99_ms", "Jitter p99 (ms)"),
+                       ("jitter_max_ms", "Jitter maks (ms)"),
+                       ("cpu_ms_per_tick", "CPU/tik (ms)"),
+                       ("cpu_percent", "CPU/oda (%)"),
+                       ("skipped_ticks", "Atlanan tik")):
+        avg, p50, p99, peak = summary(key)
+        print(f"{label:<22}{avg:>10.3f}{p50:>10.3f}{p99:>10.3f}{peak:>10.3f}")
+
+    total_cpu = sum(room["cpu_percent"] for room in room_stats)
+    print(f"\nToplam oda CPU: %{total_cpu:.1f} (tek çekirdek)")
+
+    worst = sorted(room_stats, key=lambda room: room["jitter_p99_ms"], reverse=True)[:top]
+    print(f"\nEn kötü {len(worst)} oda (jitter p99):")
+    for room in worst:
+        print(f"  Oda {room['room']:>4} {room['difficulty']:<7} tik={room['ticks']:<6}"
+              f" izleyici={room['spectators']:<3}"
+              f" jitter p99={room['jitter_p99_ms']:.2f}ms"
+              f" cpu/tik={room['cpu_ms_per_tick']:.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pong oda sunucusu için yük testi")
+    parser.add_argument("--clients", type=int, default=200, help="Simüle oyuncu sayısı")
+    parser.add_argument("--spectators", type=int, default=50, help="Simüle izleyici sayısı")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test süresi (saniye)")
+    parser.add_argument("--difficulty", nargs="*", help="Kullanılacak zorluklar (varsayılan: hepsi)")
+    parser.add_argument("--port", type=int, default=0, help="0 = boş port seç")
+    parser.add_argument("--tick", type=float, default=TICK_INTERVAL)
+    parser.add_argument("--phone-size", type=float, default=6.5)
+    parser.add_argument("--top", type=int, default=5, help="Listelenecek en kötü oda sayısı")
+    parser.add_argument("--json", help="Oda istatistiklerini bu dosyaya yaz")
+    args = parser.parse_args()
+
+    for difficulty in args.difficulty or []:
+        if difficulty.upper() not in DIFFICULTIES:
+            parser.error(f"geçersiz zorluk: {difficulty}")
+
+    room_stats, stats = asyncio.run(run_load_test(args))
+    print_report(room_stats, stats, args.top)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(room_stats, f, indent=2)
+        print(f"\nİstatistikler kaydedildi: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
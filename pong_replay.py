@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+
+import argparse
+import struct
+import sys
+import time
+
+from test2 import DIFFICULTY_SPEEDS, FRAME_BUDGET, PongCore, VerticalPongGame
+
+# Kayıt dosyası: başlık + (tik farkı varint, olay kodu, değer) kayıtları
+MAGIC = b"PGRP"
+VERSION = 2  # 2: AI tepki ve hata modeli değişti, eski AI kayıtları uyuşmaz
+HEADER = struct.Struct("<4sBdBdIIB")  # magic, sürüm, ekran boyutu, zorluk, top hızı, tohum, özet aralığı, bayraklar
+DIFFICULTIES = list(DIFFICULTY_SPEEDS)
+CHECKSUM_INTERVAL = 15  # ~1 saniyede bir durum özeti
+
+# Olay kodları
+EV_END = 0
+EV_TOP = 1         # Üst paddle konumu (girdi sonucu)
+EV_BOTTOM = 2      # Alt paddle konumu (girdi veya ağdan)
+EV_DIFFICULTY = 3  # Oyun sırasında zorluk değişti
+EV_CHECKSUM = 4    # Tik sonundaki durum özeti (CRC32)
+
+# Başlık bayrakları
+FLAG_AI = 1      # Üst paddle'ı AI oynuyor
+FLAG_SERVER = 2
+FLAG_CLIENT = 4
+
+
+class ReplayWriter:
+    def __init__(self, path, game, checksum_interval=CHECKSUM_INTERVAL):
+        multiplayer = getattr(game, "multiplayer", False)
+        flags = 0
+        if not multiplayer:
+            flags |= FLAG_AI
+        elif game.is_server:
+            flags |= FLAG_SERVER
+        else:
+            flags |= FLAG_CLIENT
+
+        self.checksum_interval = checksum_interval
+        self.last_tick = game.tick
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(
+            MAGIC, VERSION, game.phone_size, DIFFICULTIES.index(game.difficulty),
+            game.ball_speed, game.seed, checksum_interval, flags))
+        self.file.flush()
+
+    def write(self, tick, code, payload=b""):
+        # Tik farkı varint olarak: çoğu kayıt tek bayt tutar
+        delta = max(0, tick - self.last_tick)
+        self.last_tick = max(self.last_tick, tick)
+        data = bytearray()
+        while delta >= 0x80:
+            data.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        data.append(delta)
+        data.append(code)
+        self.file.write(bytes(data) + payload)
+
+    def paddle(self, tick, side, position):
+        self.write(tick, EV_TOP if side == "TOP" else EV_BOTTOM, bytes([position]))
+
+    def difficulty(self, tick, difficulty):
+        self.write(tick, EV_DIFFICULTY, bytes([DIFFICULTIES.index(difficulty)]))
+
+    def checksum(self, game):
+        if game.tick % self.checksum_interval == 0:
+            self.write(game.tick, EV_CHECKSUM, struct.pack("<I", game.state_checksum()))
+            # Uygulama öldürülürse (ör. Android) en fazla bir özet aralığı kaybolsun
+            self.file.flush()
+
+    def close(self, tick):
+        self.write(tick, EV_END)
+        self.file.close()
+
+
+class Replay:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError("kayıt dosyası çok kısa")
+        (magic, version, self.phone_size, difficulty, self.ball_speed,
+         self.seed, self.checksum_interval, self.flags) = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Pong kayıt dosyası değil")
+        if version != VERSION:
+            raise ValueError(f"desteklenmeyen kayıt sürümü: {version}")
+        self.difficulty = DIFFICULTIES[difficulty]
+
+        self.events = []
+        offset = HEADER.size
+        tick = 0
+        while offset < len(data):
+            try:
+                delta = shift = 0
+                while True:
+                    byte = data[offset]
+                    offset += 1
+                    delta |= (byte & 0x7F) << shift
+                    shift += 7
+                    if not byte & 0x80:
+                        break
+                code = data[offset]
+                offset += 1
+                if code == EV_CHECKSUM:
+                    value = struct.unpack_from("<I", data, offset)[0]
+                    offset += 4
+                elif code == EV_END:
+                    value = None
+                else:
+                    value = data[offset]
+                    offset += 1
+            except (IndexError, struct.error):
+                # Yazılırken kesilmiş dosya: son tam kayda kadar olanı kullan
+                break
+            tick += delta
+            self.events.append((tick, code, value))
+        # Düzgün kapanan kayıt EV_END ile biter
+        self.truncated = not self.events or self.events[-1][1] != EV_END
+
+    @property
+    def ai(self):
+        return bool(self.flags & FLAG_AI)
+
+    @property
+    def role(self):
+        if self.flags & FLAG_SERVER:
+            return "SERVER"
+        if self.flags & FLAG_CLIENT:
+            return "CLIENT"
+        return "TEK OYUNCU"
+
+    @property
+    def last_tick(self):
+        return self.events[-1][0] if self.events else 0
+
+    def checksums(self):
+        return {tick: value for tick, code, value in self.events if code == EV_CHECKSUM}
+
+    def new_game(self, game_class=PongCore):
+        if game_class is PongCore:
+            game = PongCore(self.phone_size, self.difficulty, seed=self.seed)
+        else:
+            game = game_class(self.phone_size, seed=self.seed)
+            game.difficulty = self.difficulty
+        game.ball_speed = self.ball_speed
+        return game
+
+
+class ReplayGame(VerticalPongGame):
+    # Tekrar oynatmada bekleme yok, sadece çizim
+    reset_ball = PongCore.reset_ball
+    game_over = PongCore.game_over
+
+
+def simulate(replay, game, on_tick=None):
+    # Olayları kaydedildiği sırayla uygula; (kontrol edilen, uyuşmayan tikler) döner
+    checked = 0
+    mismatches = []
+    for tick, code, value in replay.events:
+        while game.tick < tick:
+            if game.step() and replay.ai:
+                game.ai_move()
+            if on_tick:
+                on_tick(game)
+
+        if code == EV_TOP:
+            game.top_paddle = value
+        elif code == EV_BOTTOM:
+            game.bottom_paddle = value
+        elif code == EV_DIFFICULTY:
+            game.difficulty = DIFFICULTIES[value]
+            game.ball_speed = DIFFICULTY_SPEEDS[game.difficulty]
+        elif code == EV_CHECKSUM:
+            checked += 1
+            if game.state_checksum() != value:
+                mismatches.append(tick)
+    return checked, mismatches
+
+
+def print_info(replay):
+    print(f"Rol: {replay.role} | Zorluk: {replay.difficulty} | Top hızı: {replay.ball_speed}")
+    print(f"Ekran: {replay.phone_size} inç | Tohum: {replay.seed}")
+    print(f"Tik: {replay.last_tick} | Olay: {len(replay.events)} | Durum özeti: {len(replay.checksums())}")
+    if replay.truncated:
+        print("Uyarı: dosya kesik (EV_END yok), son tam kayda kadar okundu")
+
+
+def play(replay, speed, headless):
+    if replay.flags & FLAG_CLIENT:
+        print("Client kaydı yeniden simüle edilemez (durum server'dan gelir); 'compare' kullanın.")
+        return 1
+
+    if headless:
+        game = replay.new_game()
+        start = time.perf_counter()
+        checked, mismatches = simulate(replay, game)
+        elapsed = time.perf_counter() - start
+        rate = game.tick / elapsed if elapsed > 0 else 0.0
+        print(f"{game.tick} tik {elapsed:.3f} sn'de simüle edildi ({rate:,.0f} tik/sn)")
+    else:
+        game = replay.new_game(ReplayGame)
+        game.game_active = True
+        frame_time = FRAME_BUDGET / speed if speed > 0 else 0
+
+        def render(game):
+            game.draw_board()
+            print(f"Tekrar: tik {game.tick}/{replay.last_tick} | Hız: {speed}x | Çıkış: Ctrl+C")
+            if frame_time:
+                time.sleep(frame_time)
+
+        try:
+            checked, mismatches = simulate(replay, game, render)
+        except KeyboardInterrupt:
+            print("\nTekrar durduruldu.")
+            return 0
+
+    print(f"Skor: {game.top_score} - {game.bottom_score}")
+    if mismatches:
+        print(f"BELİRLEYİCİLİK HATASI: {len(mismatches)}/{checked} durum özeti uyuşmadı, ilk tik {mismatches[0]}")
+        return 1
+    print(f"Belirleyici: {checked} durum özetinin hepsi uyuştu")
+    return 0
+
+
+def compare(first, second):
+    a = first.checksums()
+    b = second.checksums()
+    common = sorted(set(a) & set(b))
+    if not common:
+        print("Ortak tikte durum özeti yok; kayıtlar aynı maça ait mi?")
+        return 1
+
+    mismatches = [tick for tick in common if a[tick] != b[tick]]
+    print(f"Karşılaştırılan tik: {len(common)} (1. kayıt {len(a)}, 2. kayıt {len(b)})")
+    if mismatches:
+        print(f"UYUŞMAZLIK: {len(mismatches)} tik, ilk ayrışma tik {mismatches[0]}")
+        return 1
+    print("Kayıtlar uyuşuyor")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pong maç kayıtlarını oynat ve doğrula")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    info_parser = commands.add_parser("info", help="Kayıt bilgisini göster")
+    info_parser.add_argument("file")
+
+    play_parser = commands.add_parser("play", help="Kaydı yeniden simüle et")
+    play_parser.add_argument("file")
+    play_parser.add_argument("--speed", type=float, default=1.0, help="Oynatma hızı (0 = beklemeden)")
+    play_parser.add_argument("--headless", action="store_true",
+                             help="Çizmeden en yüksek hızda simüle et ve doğrula")
+
+    compare_parser = commands.add_parser("compare", help="İki kaydın durum özetlerini karşılaştır (ör. server ve client)")
+    compare_parser.add_argument("first")
+    compare_parser.add_argument("second")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "info":
+            print_info(Replay(args.file))
+            return 0
+        if args.command == "play":
+            return play(Replay(args.file), args.speed, args.headless)
+        return compare(Replay(args.first), Replay(args.second))
+    except (OSError, ValueError) as e:
+        print(f"Kayıt okunamadı: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from collections import deque
+
+from test2 import DIFFICULTY_SPEEDS as DIFFICULTIES, FRAME_BUDGET, PongCore, percentile
+
+TICK_INTERVAL = FRAME_BUDGET  # İstemcideki oyun döngüsüyle aynı
+MAX_WRITE_BUFFER = 64 * 1024  # Yavaş istemcide bu sınırdan sonra kare atlanır
+JITTER_SAMPLES = 4096
+
+
+class RoomGame(PongCore):
+    # Sunucu tarafı simülasyon: maç sonucunu odaya duyurur
+    def __init__(self, room, difficulty, phone_size):
+        super().__init__(phone_size, difficulty)
+        self.room = room
+
+    def game_over(self):
+        self.room.broadcast(f"OVER {self.top_score},{self.bottom_score}")
+        super().game_over()
+
+
+class Client:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.room = None
+        self.role = None
+        self.waiting = None  # Eşleşme kuyruğundaysa zorluk
+        self.dropped_frames = 0
+
+    def send(self, line):
+        if self.writer.is_closing():
+            return
+        # Okumayan istemci sunucunun belleğini şişirmesin
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.dropped_frames += 1
+            return
+        self.writer.write((line + "\n").encode())
+
+
+class Room:
+    def __init__(self, room_id, difficulty, top, bottom, phone_size, tick_interval):
+        self.room_id = room_id
+        self.difficulty = difficulty
+        self.tick_interval = tick_interval
+        self.players = {"TOP": top, "BOTTOM": bottom}
+        self.spectators = set()
+        self.pending_inputs = {"TOP": 0, "BOTTOM": 0}
+        self.active = True
+        self.task = None
+        self.game = RoomGame(self, difficulty, phone_size)
+
+        # Tik zamanlama istatistikleri
+        self.jitter = deque(maxlen=JITTER_SAMPLES)
+        self.cpu_time = 0.0
+        self.skipped_ticks = 0
+        self.started = time.perf_counter()
+        self.ended = None
+
+    def broadcast(self, line):
+        for client in self.players.values():
+            client.send(line)
+        for client in self.spectators:
+            client.send(line)
+
+    def queue_input(self, role, direction):
+        # Girdiler bir sonraki tikte uygulanır, böylece tik sırası belirleyicidir
+        self.pending_inputs[role] += direction
+
+    def apply_inputs(self):
+        game = self.game
+        limit = game.board_width - game.paddle_width
+        for role, direction in self.pending_inputs.items():
+            # Tik başına en fazla bir hücre: girdi yağdıran istemci ışınlanamasın
+            direction = max(-1, min(1, direction))
+            if role == "TOP":
+                game.top_paddle = max(0, min(limit, game.top_paddle + direction))
+            else:
+                game.bottom_paddle = max(0, min(limit, game.bottom_paddle + direction))
+            self.pending_inputs[role] = 0
+
+    def step(self):
+        self.apply_inputs()
+        self.game.step()
+        game = self.game
+        self.broadcast(
+            f"S {game.tick},{game.ball_pos[0]},{game.ball_pos[1]},"
+            f"{game.top_paddle},{game.bottom_paddle},"
+            f"{game.top_score},{game.bottom_score},{game.miss_count}"
+        )
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while self.active:
+            next_tick += self.tick_interval
+            # Gecikme olmasa da döngüye sıra ver ki diğer odalar aç kalmasın
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+            if not self.active:
+                break
+
+            lateness = loop.time() - next_tick
+            self.jitter.append(lateness)
+            if lateness > self.tick_interval:
+                # Çok geride kaldıysak kaçırılan tikleri yetiştirmeye çalışma
+                skipped = int(lateness // self.tick_interval)
+                self.skipped_ticks += skipped
+                next_tick += skipped * self.tick_interval
+
+            cpu_start = time.process_time()
+            self.step()
+            self.cpu_time += time.process_time() - cpu_start
+
+    def stats(self):
+        elapsed = (self.ended or time.perf_counter()) - self.started
+        jitter_ms = [j * 1000 for j in self.jitter]
+        return {
+            "room": self.room_id,
+            "difficulty": self.difficulty,
+            "spectators": len(self.spectators),
+            "ticks": self.game.tick,
+            "skipped_ticks": self.skipped_ticks,
+            "jitter_avg_ms": sum(jitter_ms) / len(jitter_ms) if jitter_ms else 0.0,
+            "jitter_p99_ms": percentile(jitter_ms, 99),
+            "jitter_max_ms": max(jitter_ms) if jitter_ms else 0.0,
+            "cpu_ms_per_tick": self.cpu_time * 1000 / self.game.tick if self.game.tick else 0.0,
+            "cpu_percent": self.cpu_time * 100 / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+class PongServer:
+    def __init__(self, host="0.0.0.0", port=5555, tick_interval=TICK_INTERVAL, phone_size=6.5):
+        self.host = host
+        self.port = port
+        self.tick_interval = tick_interval
+        self.phone_size = phone_size
+        self.rooms = {}
+        self.queues = {difficulty: deque() for difficulty in DIFFICULTIES}
+        self.room_ids = itertools.count(1)
+        self.finished_rooms = []
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port)
+        # Port 0 verildiyse işletim sisteminin seçtiği portu kullan
+        self.port = self.server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        for room in list(self.rooms.values()):
+            self.close_room(room, "sunucu kapanıyor")
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def handle_client(self, reader, writer):
+        client = Client(reader, writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not self.handle_command(client, line.decode(errors="ignore").strip()):
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError:
+            # Satır StreamReader sınırını aştı: istemciyi düşür
+            client.send("ERR satır çok uzun")
+        finally:
+            self.leave(client)
+            writer.close()
+
+    def handle_command(self, client, line):
+        parts = line.split()
+        if not parts:
+            return True
+        command = parts[0].upper()
+
+        if command in ("L", "R"):
+            if client.room and client.role in client.room.players:
+                client.room.queue_input(client.role, -1 if command == "L" else 1)
+        elif command == "JOIN":
+            difficulty = parts[1].upper() if len(parts) > 1 else "NORMAL"
+            if difficulty not in DIFFICULTIES:
+                client.send("ERR geçersiz zorluk")
+            elif client.room or client.waiting:
+                client.send("ERR zaten oyunda")
+            else:
+                self.matchmake(client, difficulty)
+        elif command == "WATCH":
+            self.watch(client, parts[1] if len(parts) > 1 else None)
+        elif command == "LIST":
+            rooms = ",".join(
+                f"{room.room_id}:{room.difficulty}:{len(room.spectators)}"
+                for room in self.rooms.values()
+            )
+            client.send(f"ROOMS {rooms}")
+        elif command == "PING":
+            # İstemci RTT ölçümü: zaman damgasını aynen geri yolla
+            client.send("PONG" + line[4:])
+        elif command == "QUIT":
+            return False
+        else:
+            client.send("ERR bilinmeyen komut")
+        return True
+
+    def matchmake(self, client, difficulty):
+        queue = self.queues[difficulty]
+        if queue:
+            opponent = queue.popleft()
+            opponent.waiting = None
+            self.create_room(difficulty, opponent, client)
+        else:
+            client.waiting = difficulty
+            queue.append(client)
+            client.send("WAIT")
+
+    def create_room(self, difficulty, top, bottom):
+        room = Room(next(self.room_ids), difficulty, top, bottom,
+                    self.phone_size, self.tick_interval)
+        self.rooms[room.room_id] = room
+        for role, client in room.players.items():
+            client.room = room
+            client.role = role
+            client.send(f"ROOM {room.room_id} {role} {room.game.board_width},{room.game.board_height},{room.game.paddle_width}")
+        room.task = asyncio.create_task(room.run())
+        return room
+
+    def watch(self, client, room_id):
+        if client.room or client.waiting:
+            client.send("ERR zaten oyunda")
+            return
+        if room_id is None:
+            # Oda belirtilmezse rastgele bir maçı izle
+            room = random.choice(list(self.rooms.values())) if self.rooms else None
+        else:
+            try:
+                room = self.rooms.get(int(room_id))
+            except ValueError:
+                room = None
+        if room is None:
+            client.send("ERR oda bulunamadı")
+            return
+        room.spectators.add(client)
+        client.room = room
+        client.role = "SPECTATOR"
+        client.send(f"ROOM {room.room_id} SPECTATOR {room.game.board_width},{room.game.board_height},{room.game.paddle_width}")
+
+    def leave(self, client):
+        if client.waiting:
+            try:
+                self.queues[client.waiting].remove(client)
+            except ValueError:
+                pass
+            client.waiting = None
+        room = client.room
+        if room is None:
+            return
+        if client.role == "SPECTATOR":
+            room.spectators.discard(client)
+            client.room = None
+        else:
+            # Oyunculardan biri ayrılınca maç biter
+            self.close_room(room, "rakip ayrıldı")
+
+    def close_room(self, room, reason):
+        if not room.active:
+            return
+        room.active = False
+        room.ended = time.perf_counter()
+        room.broadcast(f"END {reason}")
+        self.finished_rooms.append(room.stats())
+        for client in list(room.players.values()) + list(room.spectators):
+            client.room = None
+            client.role = None
+        self.rooms.pop(room.room_id, None)
+
+    def stats(self):
+        return self.finished_rooms + [room.stats() for room in self.rooms.values()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Çok odalı Pong sunucusu (ekransız)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=5555)
+    parser.add_argument("--tick", type=float, default=TICK_INTERVAL,
+                        help="Tik aralığı (saniye)")
+    parser.add_argument("--phone-size", type=float, default=6.5,
+                        help="Oyun alanı boyutu için ekran boyutu (inç)")
+    args = parser.parse_args()
+
+    server = PongServer(args.host, args.port, args.tick, args.phone_size)
+
+    async def run():
+        port = await server.start()
+        print(f"Pong sunucusu dinleniyor: {args.host}:{port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\nSunucu kapatılıyor...")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+
+import argparse
+import time
+from collections import Counter
+
+from test2 import AI_PROFILES, DIFFICULTY_SPEEDS, PongCore, bounce_table
+
+# Toplu (vektörel) mod için numpy isteğe bağlı
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MAX_MATCH_TICKS = 5000  # Bu kadar tikte bitmeyen maç zaman aşımı sayılır
+
+
+class MatchStats:
+    def __init__(self, difficulty):
+        self.difficulty = difficulty
+        self.matches = 0
+        self.ai_wins = 0
+        self.timeouts = 0
+        self.ticks = 0
+        self.elapsed = 0.0
+        self.rallies = Counter()  # Ralli uzunluğu -> sayı adedi
+
+    def finished(self):
+        return self.matches + self.timeouts
+
+    def rally_percentile(self, pct):
+        total = sum(self.rallies.values())
+        if not total:
+            return 0
+        limit = pct / 100.0 * total
+        seen = 0
+        for length in sorted(self.rallies):
+            seen += self.rallies[length]
+            if seen >= limit:
+                return length
+        return max(self.rallies)
+
+    def row(self):
+        points = sum(self.rallies.values())
+        avg_rally = sum(k * v for k, v in self.rallies.items()) / points if points else 0.0
+        # Hiç maç bitmediyse oran yok, %0 gibi görünmesin
+        win_rate = f"{self.ai_wins * 100.0 / self.matches:.1f}%" if self.matches else "-"
+        speed = self.ticks / self.elapsed if self.elapsed > 0 else 0.0
+        return (f"{self.difficulty:<8}{self.matches:>9}{win_rate:>10}{self.timeouts:>9}"
+                f"{avg_rally:>9.2f}{self.rally_percentile(50):>6}{self.rally_percentile(99):>6}"
+                f"{max(self.rallies) if self.rallies else 0:>6}{speed:>14,.0f}")
+
+
+class SimGame(PongCore):
+    # Üst paddle: test edilen AI, alt paddle: rakip AI
+    def __init__(self, phone_size, difficulty, opponent, stats, ball_speed=None, seed=None):
+        super().__init__(phone_size, difficulty, seed)
+        if ball_speed:
+            self.ball_speed = ball_speed
+        self.opponent = opponent
+        self.stats = stats
+        self.match_ticks = 0
+
+    def point_scored(self, side):
+        self.stats.rallies[self.rally] += 1
+        super().point_scored(side)
+
+    def game_over(self):
+        self.stats.matches += 1
+        if self.top_score > self.bottom_score:
+            self.stats.ai_wins += 1
+        self.match_ticks = 0
+        super().game_over()
+
+    def restart(self):
+        # Zaman aşımında sonucu saymadan yeni maça geç; yarım kalan ralli yine sayılır
+        self.stats.timeouts += 1
+        self.stats.rallies[self.rally] += 1
+        self.rally = 0
+        self.match_ticks = 0
+        PongCore.game_over(self)
+
+    def play_tick(self, max_match_ticks=MAX_MATCH_TICKS):
+        self.match_ticks += 1
+        self.stats.ticks += 1
+        if self.step():
+            self.ai_move("TOP")
+            self.ai_move("BOTTOM", self.opponent)
+        if self.match_ticks >= max_match_ticks:
+            self.restart()
+
+
+class BatchPong:
+    # N bağımsız oyunu NumPy dizileriyle aynı anda ilerletir.
+    # Kurallar PongCore.step ve PongCore.ai_move ile birebir aynıdır.
+    def __init__(self, lanes, phone_size, difficulty, opponent, ball_speed=None, seed=None, quota=1):
+        if np is None:
+            raise RuntimeError("Toplu mod için numpy gerekli: pip install numpy")
+
+        # Oyun alanı boyutlarını çekirdekten al
+        core = PongCore(phone_size, difficulty)
+        self.width = core.board_width
+        self.height = core.board_height
+        self.paddle_width = core.paddle_width
+        self.max_misses = core.max_misses
+        self.ball_speed = ball_speed or core.ball_speed
+        self.difficulty = difficulty
+        self.opponent = opponent
+        self.lanes = lanes
+        self.rng = np.random.default_rng(seed)
+        self.bounce = np.array(bounce_table(self.width), dtype=np.int64)
+
+        start_paddle = self.width // 2 - self.paddle_width // 2
+        self.ball_x = np.full(lanes, self.width // 2, dtype=np.int64)
+        self.ball_y = np.full(lanes, self.height // 2, dtype=np.int64)
+        self.vel_x = np.zeros(lanes)
+        self.vel_y = np.zeros(lanes)
+        self.top = np.full(lanes, start_paddle, dtype=np.int64)
+        self.bottom = np.full(lanes, start_paddle, dtype=np.int64)
+        self.top_score = np.zeros(lanes, dtype=np.int64)
+        self.bottom_score = np.zeros(lanes, dtype=np.int64)
+        self.miss_count = np.zeros(lanes, dtype=np.int64)
+        self.rally = np.zeros(lanes, dtype=np.int64)
+        self.serves = np.zeros(lanes, dtype=np.int64)
+        self.match_ticks = np.zeros(lanes, dtype=np.int64)
+        # Her oyun sadece ilk `quota` maçını sayar (sayı veya oyun başına dizi); kısa maçlar öne geçip sonucu çarpıtmasın
+        self.quota = quota
+        self.finished = np.zeros(lanes, dtype=np.int64)
+
+        # Taraf başına AI durumu (PongCore.ai_state'in dizi hali, -2 = henüz görülmedi)
+        self.ai_state = {
+            side: {
+                "direction": np.full(lanes, -2, dtype=np.int64),
+                "serve": np.full(lanes, -2, dtype=np.int64),
+                "wait": np.zeros(lanes, dtype=np.int64),
+                "decided": np.zeros(lanes, dtype=bool),
+                "has_target": np.zeros(lanes, dtype=bool),
+                "target": np.zeros(lanes, dtype=np.int64),
+            }
+            for side in ("TOP", "BOTTOM")
+        }
+
+        # Her oyun rastgele servisle başlar; sabit ilk servis sonucu oyun sayısına bağlamasın
+        self.reset_balls(np.ones(lanes, dtype=bool))
+
+    def done(self):
+        return bool((self.finished >= self.quota).all())
+
+    def reset_balls(self, mask):
+        count = int(np.count_nonzero(mask))
+        if not count:
+            return
+        self.ball_x[mask] = self.width // 2
+        self.ball_y[mask] = self.height // 2
+        self.serves[mask] += 1
+        self.vel_x[mask] = self.rng.choice([-1.0, 1.0], count) * 0.7
+        self.vel_y[mask] = self.rng.choice([-1.0, 1.0], count)
+
+    def reset_matches(self, mask):
+        self.top_score[mask] = 0
+        self.bottom_score[mask] = 0
+        self.miss_count[mask] = 0
+        self.match_ticks[mask] = 0
+        self.reset_balls(mask)
+
+    def step(self, stats, max_match_ticks=MAX_MATCH_TICKS):
+        half = self.paddle_width // 2
+        counting = self.finished < self.quota
+        self.match_ticks += 1
+
+        # Topu hareket ettir (int() gibi sıfıra doğru kırp)
+        self.ball_x += np.trunc(self.vel_x * self.ball_speed).astype(np.int64)
+        self.ball_y += np.trunc(self.vel_y * self.ball_speed).astype(np.int64)
+
+        # Sol ve sağ duvarlardan sekme (taşan kısım geri yansır)
+        wall = (self.ball_x <= 0) | (self.ball_x >= self.width - 1)
+        self.vel_x[wall] *= -1
+        self.ball_x[wall] = self.bounce[self.ball_x[wall] % len(self.bounce)]
+
+        # Paddle çarpışmaları
+        top_zone = self.ball_y <= 0
+        bottom_zone = ~top_zone & (self.ball_y >= self.height - 1)
+        top_hit = top_zone & (self.top <= self.ball_x) & (self.ball_x < self.top + self.paddle_width)
+        bottom_hit = bottom_zone & (self.bottom <= self.ball_x) & (self.ball_x < self.bottom + self.paddle_width)
+        hit = top_hit | bottom_hit
+        self.vel_y[top_hit] = np.abs(self.vel_y[top_hit])
+        self.vel_y[bottom_hit] = -np.abs(self.vel_y[bottom_hit])
+        paddle = np.where(top_hit, self.top, self.bottom)
+        self.vel_x[hit] = (self.ball_x[hit] - (paddle[hit] + half)) / half * 1.5
+        self.rally[hit] += 1
+
+        # Kaçırılan toplar
+        top_miss = top_zone & ~top_hit
+        bottom_miss = bottom_zone & ~bottom_hit
+        scored = top_miss | bottom_miss
+        if scored.any():
+            self.bottom_score[top_miss] += 1
+            self.top_score[bottom_miss] += 1
+            self.miss_count[scored] += 1
+            rallies = np.bincount(self.rally[scored & counting])
+            for length in np.nonzero(rallies)[0]:
+                stats.rallies[int(length)] += int(rallies[length])
+            self.rally[scored] = 0
+            self.reset_balls(scored)
+
+        # Biten maçlar
+        over = self.miss_count >= self.max_misses
+        if over.any():
+            counted = over & counting
+            stats.matches += int(np.count_nonzero(counted))
+            stats.ai_wins += int(np.count_nonzero(counted & (self.top_score > self.bottom_score)))
+            self.finished[over] += 1
+            self.reset_matches(over)
+
+        # Maçı biten oyunlarda AI bu tik hareket etmez
+        active = ~over
+        self.ai_move(active, "TOP", self.difficulty)
+        self.ai_move(active, "BOTTOM", self.opponent)
+        stats.ticks += int(np.count_nonzero(counting))
+
+        # Zaman aşımı
+        timeout = self.match_ticks >= max_match_ticks
+        if timeout.any():
+            counted = timeout & counting
+            stats.timeouts += int(np.count_nonzero(counted))
+            # Yarım kalan ralli de sayılır (SimGame.restart ile aynı)
+            rallies = np.bincount(self.rally[counted])
+            for length in np.nonzero(rallies)[0]:
+                stats.rallies[int(length)] += int(rallies[length])
+            self.finished[timeout] += 1
+            self.rally[timeout] = 0
+            self.reset_matches(timeout)
+
+    def ball_step(self):
+        return (np.trunc(self.vel_x * self.ball_speed).astype(np.int64),
+                np.trunc(self.vel_y * self.ball_speed).astype(np.int64))
+
+    def predict_intercept(self, side, dx, dy):
+        # PongCore.predict_intercept gibi; top uzaklaşıyorsa orta sütun
+        if side == "TOP":
+            approaching = dy < 0
+            distance = self.ball_y
+        else:
+            approaching = dy > 0
+            distance = self.height - 1 - self.ball_y
+        ticks = -(-distance // np.where(approaching, np.abs(dy), 1))
+        column = self.bounce[(self.ball_x + dx * ticks) % len(self.bounce)]
+        return np.where(approaching, column, self.width // 2)
+
+    def ai_move(self, active, side, difficulty):
+        profile = AI_PROFILES[difficulty]
+        state = self.ai_state[side]
+        paddle = self.top if side == "TOP" else self.bottom
+        dx, dy = self.ball_step()
+
+        # Vuruş veya yeni servis: tepki süresi boyunca eski hedefe devam et
+        direction = np.sign(dy)
+        changed = active & ((direction != state["direction"]) | (self.serves != state["serve"]))
+        state["direction"][changed] = direction[changed]
+        state["serve"][changed] = self.serves[changed]
+        state["wait"][changed] = profile["reaction_delay"]
+        state["decided"][changed] = False
+
+        waiting = active & (state["wait"] > 0)
+        state["wait"][waiting] -= 1
+
+        decide = active & ~waiting & ~state["decided"]
+        if decide.any():
+            intercept = self.predict_intercept(side, dx, dy)[decide]
+            noise = profile["noise"]
+            if noise:
+                error = self.rng.normal(0, noise * self.paddle_width, len(intercept))
+                intercept += np.rint(error).astype(np.int64)
+            state["target"][decide] = intercept - self.paddle_width // 2
+            state["decided"][decide] = True
+            state["has_target"][decide] = True
+
+        speed = profile["paddle_speed"]
+        target = np.clip(state["target"], 0, self.width - self.paddle_width)
+        move = np.clip(target - paddle, -speed, speed)
+        paddle += np.where(active & state["has_target"], move, 0)
+
+
+def run_sequential(difficulty, opponent, matches, phone_size, ball_speed=None,
+                   max_match_ticks=MAX_MATCH_TICKS, seed=None):
+    stats = MatchStats(difficulty)
+    game = SimGame(phone_size, difficulty, opponent, stats, ball_speed, seed)
+    start = time.perf_counter()
+    while stats.finished() < matches:
+        game.play_tick(max_match_ticks)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def run_batch(difficulty, opponent, matches, lanes, phone_size, ball_speed=None,
+              max_match_ticks=MAX_MATCH_TICKS, seed=None):
+    stats = MatchStats(difficulty)
+    lanes = min(lanes, matches)
+    # Maçları oyunlara dağıt: toplam tam olarak `matches` olsun
+    quota = np.full(lanes, matches // lanes, dtype=np.int64)
+    quota[:matches % lanes] += 1
+    batch = BatchPong(lanes, phone_size, difficulty, opponent, ball_speed, seed, quota)
+    start = time.perf_counter()
+    while not batch.done():
+        batch.step(stats, max_match_ticks)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"en az 1 olmalı: {value}")
+    return value
+
+
+def vertical_step(difficulty, ball_speed=None):
+    # Servisteki dikey adım (vy = ±1); 0 ise top dikeyde hiç ilerlemez
+    return int(ball_speed or DIFFICULTY_SPEEDS[difficulty])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ekransız Pong simülasyonu: zorluk başına kazanma oranı ve ralli uzunluğu")
+    parser.add_argument("--difficulty", nargs="*", default=list(DIFFICULTY_SPEEDS),
+                        help="Test edilecek AI zorlukları (üst paddle)")
+    parser.add_argument("--opponent", default="NORMAL", help="Rakip AI zorluğu (alt paddle)")
+    parser.add_argument("--matches", type=positive_int, default=1000, help="Zorluk başına maç sayısı")
+    parser.add_argument("--batch", action="store_true", help="NumPy ile vektörel toplu mod")
+    parser.add_argument("--lanes", type=positive_int, default=4096, help="Toplu modda paralel oyun sayısı")
+    parser.add_argument("--phone-size", type=float, default=6.5)
+    parser.add_argument("--ball-speed", type=float, help="Zorluğun top hızı yerine bunu kullan")
+    parser.add_argument("--max-match-ticks", type=positive_int, default=MAX_MATCH_TICKS)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    difficulties = [d.upper() for d in args.difficulty]
+    opponent = args.opponent.upper()
+    for difficulty in difficulties + [opponent]:
+        if difficulty not in DIFFICULTY_SPEEDS:
+            parser.error(f"geçersiz zorluk: {difficulty}")
+    if args.batch and np is None:
+        parser.error("toplu mod için numpy gerekli: pip install numpy")
+    if args.ball_speed is not None and int(args.ball_speed) == 0:
+        parser.error(f"--ball-speed {args.ball_speed} ile dikey adım 0, maçlar hiç bitmez (en az 1 olmalı)")
+
+    mode = f"toplu ({args.lanes} paralel oyun)" if args.batch else "tek tek"
+    print(f"Mod: {mode} | Rakip: {opponent} | Zorluk başına {args.matches} maç")
+    print(f"\n{'ZORLUK':<8}{'MAÇ':>9}{'AI KAZ.':>10}{'Z.AŞIMI':>9}"
+          f"{'RALLİ':>9}{'P50':>6}{'P99':>6}{'MAKS':>6}{'TİK/SN':>14}")
+    for difficulty in difficulties:
+        if vertical_step(difficulty, args.ball_speed) == 0:
+            # Her maç zaman aşımına kadar boşuna koşardı
+            print(f"{difficulty:<8}atlandı: top hızı {DIFFICULTY_SPEEDS[difficulty]} ile dikey adım 0"
+                  f" (--ball-speed 1 ile deneyin)")
+            continue
+        if args.batch:
+            stats = run_batch(difficulty, opponent, args.matches, args.lanes, args.phone_size,
+                              args.ball_speed, args.max_match_ticks, args.seed)
+        else:
+            stats = run_sequential(difficulty, opponent, args.matches, args.phone_size,
+                                   args.ball_speed, args.max_match_ticks, args.seed)
+        print(stats.row())
+
+
+if __name__ == "__main__":
+    main()
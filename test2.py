@@ -1,3 +1,5 @@
+import argparse
+import json
 import socket
 import threading
 import time
@@ -5,6 +7,10 @@ import sys
 import select
 import os
 import random
+import functools
+import struct
+import zlib
+from collections import deque
 
 # Windows ve Unix için farklı key input
 try:
@@ -13,33 +19,375 @@ except ImportError:
     import tty
     import termios
 
-class VerticalPongGame:
-    def __init__(self):
-        # Ekran boyutuna göre dinamik boyutlandırma
-        self.phone_size = 6.5  # Varsayılan
-        self.setup_display_size()
-        
+FRAME_BUDGET = 0.066  # ~15 FPS, Termux için
+PING_INTERVAL = 1.0  # RTT ölçümü için ping aralığı (saniye)
+
+# Zorluk -> top hızı
+DIFFICULTY_SPEEDS = {"KOLAY": 0.7, "NORMAL": 1.0, "ZOR": 1.4}
+
+# Zorluk -> AI profili
+# reaction_delay: top dikey yön değiştirdikten (vuruş, servis) sonra AI'nın tepki vermeden beklediği tik
+# noise: hedef sütun hatasının standart sapması, paddle genişliği cinsinden
+#        (paddle'ın yarısını aşan hata ıska demek; ekran boyutundan bağımsız)
+# paddle_speed: tik başına en fazla kaç hücre hareket
+AI_PROFILES = {
+    "KOLAY": {"reaction_delay": 8, "noise": 0.7, "paddle_speed": 1},
+    "NORMAL": {"reaction_delay": 4, "noise": 0.4, "paddle_speed": 1},
+    "ZOR": {"reaction_delay": 1, "noise": 0.3, "paddle_speed": 2},
+}
+
+@functools.lru_cache(maxsize=None)
+def bounce_table(board_width):
+    # Aynalanmış koordinat -> gerçek sütun (yan duvarlardan sekmeler dahil).
+    # Periyot 2 * (genişlik - 1): u sütunu için gerçek konum table[u % len(table)]
+    last = board_width - 1
+    return tuple(u if u <= last else 2 * last - u for u in range(2 * last))
+
+class PongCore:
+    # Ekransız oyun çekirdeği: sadece fizik ve yapay zeka.
+    # Çizim, girdi ve ağ VerticalPongGame'de; simülasyon ve sunucu bunu doğrudan kullanır.
+    def __init__(self, phone_size=6.5, difficulty="NORMAL", seed=None):
+        self.apply_display_size(phone_size)
+        # Oyun başına RNG: aynı tohum + aynı girdiler = aynı maç (tekrar oynatma için)
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.tick = 0
+
         self.ball_pos = [self.board_width // 2, self.board_height // 2]
         self.ball_vel = [1, -1]
         self.top_paddle = self.board_width // 2 - self.paddle_width // 2
         self.bottom_paddle = self.board_width // 2 - self.paddle_width // 2
         self.top_score = 0
         self.bottom_score = 0
+        self.difficulty = difficulty
+        self.ball_speed = DIFFICULTY_SPEEDS[difficulty]
+        self.miss_count = 0
+        self.max_misses = 3
+        self.rally = 0  # Son sayıdan beri paddle vuruşu
+        self.serves = 0  # reset_ball sayacı; AI yeni servisi buradan anlar
+        # Taraf başına AI durumu: son görülen dikey yön ve servis, tepki sayacı, hedef
+        self.ai_state = {
+            side: {"direction": None, "serve": None, "wait": 0, "decided": False, "target": None}
+            for side in ("TOP", "BOTTOM")
+        }
+
+    def apply_display_size(self, phone_size):
+        # Ekran boyutuna göre oyun alanını ayarla
+        self.phone_size = phone_size
+        if self.phone_size <= 5.0:
+            self.board_width = 20
+            self.board_height = 30
+            self.paddle_width = 2
+        elif self.phone_size <= 6.5:
+            self.board_width = 25
+            self.board_height = 35
+            self.paddle_width = 3
+        else:
+            self.board_width = 30
+            self.board_height = 40
+            self.paddle_width = 4
+
+    def step(self):
+        # Bir tik ilerlet; maç bittiyse False döner
+        self.tick += 1
+
+        # Topu hareket ettir
+        dx, dy = self.ball_step()
+        self.ball_pos[0] += dx
+        self.ball_pos[1] += dy
+
+        # Sol ve sağ duvarlardan sekme: taşan kısım geri yansır, top alandan çıkmaz
+        if self.ball_pos[0] <= 0 or self.ball_pos[0] >= self.board_width - 1:
+            self.ball_vel[0] *= -1
+            table = bounce_table(self.board_width)
+            self.ball_pos[0] = table[self.ball_pos[0] % len(table)]
+
+        # Üst paddle kontrolü
+        if self.ball_pos[1] <= 0:
+            if (self.top_paddle <= self.ball_pos[0] < self.top_paddle + self.paddle_width):
+                self.ball_vel[1] = abs(self.ball_vel[1])  # Aşağı dön
+                # Topun paddle'ın neresine çarptığına göre açı değiştir
+                paddle_center = self.top_paddle + self.paddle_width // 2
+                offset = (self.ball_pos[0] - paddle_center) / (self.paddle_width // 2)
+                self.ball_vel[0] = offset * 1.5
+                self.rally += 1
+            else:
+                self.point_scored("BOTTOM")
+
+        # Alt paddle kontrolü
+        elif self.ball_pos[1] >= self.board_height - 1:
+            if (self.bottom_paddle <= self.ball_pos[0] < self.bottom_paddle + self.paddle_width):
+                self.ball_vel[1] = -abs(self.ball_vel[1])  # Yukarı dön
+                # Topun paddle'ın neresine çarptığına göre açı değiştir
+                paddle_center = self.bottom_paddle + self.paddle_width // 2
+                offset = (self.ball_pos[0] - paddle_center) / (self.paddle_width // 2)
+                self.ball_vel[0] = offset * 1.5
+                self.rally += 1
+            else:
+                self.point_scored("TOP")
+
+        # 3 kaçırmada oyunu bitir
+        if self.miss_count >= self.max_misses:
+            self.game_over()
+            return False
+        return True
+
+    def point_scored(self, side):
+        if side == "TOP":
+            self.top_score += 1
+        else:
+            self.bottom_score += 1
+        self.miss_count += 1
+        self.rally = 0
+        self.reset_ball()
+
+    def reset_ball(self):
+        self.ball_pos = [self.board_width // 2, self.board_height // 2]
+        self.serves += 1
+        # Rastgele başlangıç yönü
+        self.ball_vel = [self.rng.choice([-1, 1]) * 0.7, self.rng.choice([-1, 1])]
+
+    def game_over(self):
+        # Skorları sıfırla
+        self.top_score = 0
+        self.bottom_score = 0
+        self.miss_count = 0
+        self.reset_ball()
+
+    def state_checksum(self):
+        # Ağ üzerinden de gönderilen alanların CRC32'si; server ve client kayıtları karşılaştırılabilir
+        return zlib.crc32(struct.pack(
+            "<7i", self.tick, self.ball_pos[0], self.ball_pos[1], self.top_paddle,
+            self.top_score, self.bottom_score, self.miss_count))
+
+    def ball_step(self):
+        # Topun bir tikteki hücre adımı (x, y)
+        return int(self.ball_vel[0] * self.ball_speed), int(self.ball_vel[1] * self.ball_speed)
+
+    def predict_intercept(self, side):
+        # Topun paddle satırına vardığı sütun, O(1); top uzaklaşıyorsa None
+        dx, dy = self.ball_step()
+        if side == "TOP":
+            if dy >= 0:
+                return None
+            ticks = -(-self.ball_pos[1] // -dy)
+        else:
+            if dy <= 0:
+                return None
+            ticks = -(-(self.board_height - 1 - self.ball_pos[1]) // dy)
+        table = bounce_table(self.board_width)
+        return table[(self.ball_pos[0] + dx * ticks) % len(table)]
+
+    def ai_move(self, side="TOP", difficulty=None):
+        profile = AI_PROFILES[difficulty or self.difficulty]
+        state = self.ai_state[side]
+        paddle = self.top_paddle if side == "TOP" else self.bottom_paddle
+
+        # Vuruş veya yeni servis: tepki süresi boyunca eski hedefe devam et.
+        # Yan duvar sekmesi tahmini değiştirmez, yeniden düşünmeye gerek yok.
+        dy = self.ball_step()[1]
+        direction = (dy > 0) - (dy < 0)
+        if direction != state["direction"] or self.serves != state["serve"]:
+            state["direction"] = direction
+            state["serve"] = self.serves
+            state["wait"] = profile["reaction_delay"]
+            state["decided"] = False
+
+        if state["wait"] > 0:
+            state["wait"] -= 1
+        elif not state["decided"]:
+            intercept = self.predict_intercept(side)
+            if intercept is None:
+                # Top uzaklaşıyor: ortaya dön
+                intercept = self.board_width // 2
+            noise = profile["noise"]
+            if noise:
+                intercept += round(self.rng.gauss(0, noise * self.paddle_width))
+            state["target"] = intercept - self.paddle_width // 2
+            state["decided"] = True
+
+        if state["target"] is None:
+            return
+        target_x = max(0, min(self.board_width - self.paddle_width, state["target"]))
+
+        # Yumuşak hareket, zorluğa göre hızlı
+        speed = profile["paddle_speed"]
+        paddle += max(-speed, min(speed, target_x - paddle))
+
+        if side == "TOP":
+            self.top_paddle = paddle
+        else:
+            self.bottom_paddle = paddle
+
+def numbered_path(path):
+    # Her maç ayrı dosyaya: mac.rpl -> mac-1.rpl, mac-2.rpl, ... (var olan dosya ezilmez)
+    base, ext = os.path.splitext(path)
+    number = 1
+    while os.path.exists(f"{base}-{number}{ext}"):
+        number += 1
+    return f"{base}-{number}{ext}"
+
+def seed_value(text):
+    # Tohum kayıt başlığında 32 bit işaretsiz tutulur
+    seed = int(text)
+    if not 0 <= seed < 2 ** 32:
+        raise argparse.ArgumentTypeError(f"tohum 0 ile {2 ** 32 - 1} arasında olmalı: {seed}")
+    return seed
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+class FrameProfiler:
+    # Kare başına faz süreleri, kare süresi yüzdelikleri, düşen kareler ve ağ ölçümleri
+    def __init__(self, frame_budget=FRAME_BUDGET, window=300):
+        self.frame_budget = frame_budget
+        self.frame_times = deque(maxlen=window)  # Son kareler, ms
+        self.phases = {}
+        self.last_phases = {}  # Tamamlanmış son kare; katman bunu gösterir
+        self.frames = 0
+        self.dropped_frames = 0
+        self.frame_dropped = 0
+        self.stall = 0.0  # Bu karede bilerek beklenen süre (sn), ör. sayı sonrası
+        self.unrecorded_stall = 0.0
+        self.trace = None
+        self.started = time.perf_counter()
+
+        # Ağ
+        self.rtt_samples = deque(maxlen=30)  # ms
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.sent_rate = 0.0  # bayt/sn
+        self.received_rate = 0.0
+        self.rate_window_start = self.started
+        self.window_sent = 0
+        self.window_received = 0
+
+    def open_trace(self, path):
+        # JSON-lines: her kare bir satır
+        self.trace = open(path, "a")
+
+    def close(self):
+        if self.trace:
+            self.trace.close()
+            self.trace = None
+
+    def begin_frame(self, frame_time):
+        # frame_time: bir önceki kare başlangıcından bu yana geçen süre (sn)
+        self.frames += 1
+        self.phases = {}
+        self.stall = 0.0
+        self.unrecorded_stall = 0.0
+        self.frame_times.append(frame_time * 1000)
+        # Bütçenin katları kadar geciktiysek aradaki kareler düşmüş sayılır
+        dropped = max(0, round(frame_time / self.frame_budget) - 1)
+        self.dropped_frames += dropped
+        self.frame_dropped = dropped
+
+    def record(self, phase, start):
+        # Fazın içindeki planlı bekleme faz süresine sayılmaz
+        self.phases[phase] = (time.perf_counter() - start - self.unrecorded_stall) * 1000
+        self.unrecorded_stall = 0.0
+
+    def add_stall(self, seconds):
+        self.stall += seconds
+        self.unrecorded_stall += seconds
+
+    def add_sent(self, count):
+        self.bytes_sent += count
+        self.window_sent += count
+
+    def add_received(self, count):
+        self.bytes_received += count
+        self.window_received += count
+
+    def add_rtt(self, seconds):
+        self.rtt_samples.append(seconds * 1000)
+
+    def update_rates(self):
+        now = time.perf_counter()
+        elapsed = now - self.rate_window_start
+        if elapsed >= 1.0:
+            self.sent_rate = self.window_sent / elapsed
+            self.received_rate = self.window_received / elapsed
+            self.window_sent = 0
+            self.window_received = 0
+            self.rate_window_start = now
+
+    def end_frame(self):
+        # Katman bir sonraki karenin draw_board'unda çizilir, o sırada phases yarımdır
+        self.last_phases = dict(self.phases)
+        self.update_rates()
+        if not self.trace:
+            return
+        entry = {
+            "frame": self.frames,
+            "t": round(time.perf_counter() - self.started, 4),
+            "frame_ms": round(self.frame_times[-1], 3),
+            "dropped": self.frame_dropped,
+        }
+        if self.stall:
+            entry["stall_ms"] = round(self.stall * 1000, 3)
+        for phase, ms in self.phases.items():
+            entry[phase + "_ms"] = round(ms, 3)
+        if self.rtt_samples:
+            entry["rtt_ms"] = round(self.rtt_samples[-1], 2)
+        entry["sent_bps"] = round(self.sent_rate)
+        entry["received_bps"] = round(self.received_rate)
+        self.trace.write(json.dumps(entry) + "\n")
+
+    def overlay_lines(self):
+        frames = list(self.frame_times)
+        lines = [
+            f"PROFİL kare p50 {percentile(frames, 50):.1f}ms p99 {percentile(frames, 99):.1f}ms"
+            f" | bütçe {self.frame_budget * 1000:.0f}ms | düşen {self.dropped_frames}",
+            " | ".join(f"{phase} {ms:.2f}ms" for phase, ms in self.last_phases.items()) or "-",
+        ]
+        if self.rtt_samples:
+            rtt = list(self.rtt_samples)
+            lines.append(
+                f"RTT {rtt[-1]:.1f}ms (ort {sum(rtt) / len(rtt):.1f}) | "
+                f"gönderilen {self.sent_rate / 1024:.2f} KB/s | alınan {self.received_rate / 1024:.2f} KB/s")
+        return lines
+
+class VerticalPongGame(PongCore):
+    def __init__(self, phone_size=None, seed=None, record_path=None, trace_path=None, show_profiler=False):
+        if phone_size is None:
+            # Ekran boyutuna göre dinamik boyutlandırma
+            self.setup_display_size()
+            self.display_setup_done = True
+            phone_size = self.phone_size
+        super().__init__(phone_size, seed=seed)
+
+        self.record_path = record_path
+        self.recorder = None
+        self.trace_path = trace_path
+        self.show_profiler = show_profiler
+        self.profiler = FrameProfiler()
+        self.net_buffer = ""
+        self.last_ping = 0.0
+
         self.game_active = False
         self.paused = False
-        self.difficulty = "NORMAL"
-        self.ball_speed = 1.0
         self.multiplayer = False
         self.is_server = False
         self.connection = None
         self.control_scheme = "ARROWS"
-        self.miss_count = 0
-        self.max_misses = 3
         self.server_ip = "127.0.0.1"
         self.port = 5555
         self.connected = False
         self.waiting_for_connection = False
 
+        # Çok odalı sunucu (pong_server.py) istemcisi
+        self.room_mode = False
+        self.spectate = False
+        self.room_id = None
+        self.room_role = None
+        self.room_status = "BAĞLANILIYOR"
+
     def setup_display_size(self):
         # Ekran boyutunu ayarla
         try:
@@ -48,19 +396,7 @@ class VerticalPongGame:
         except:
             self.phone_size = 6.5
         
-        # Ekran boyutuna göre oyun alanını ayarla
-        if self.phone_size <= 5.0:
-            self.board_width = 20
-            self.board_height = 30
-            self.paddle_width = 2
-        elif self.phone_size <= 6.5:
-            self.board_width = 25
-            self.board_height = 35
-            self.paddle_width = 3
-        else:
-            self.board_width = 30
-            self.board_height = 40
-            self.paddle_width = 4
+        self.apply_display_size(self.phone_size)
 
     def clear_screen(self):
         os.system('cls' if os.name == 'nt' else 'clear')
@@ -109,7 +445,9 @@ class VerticalPongGame:
         
         # Bilgi çubuğu
         info_line = f"Zorluk: {self.difficulty} | Kaçırma: {self.miss_count}/{self.max_misses}"
-        if self.multiplayer:
+        if self.room_mode:
+            info_line += f" | {self.room_status}"
+        elif self.multiplayer:
             role = "Server" if self.is_server else "Client"
             status = "BAĞLANDI" if self.connected else "BEKLENİYOR"
             info_line += f" | {role}({status})"
@@ -125,9 +463,13 @@ class VerticalPongGame:
         if not self.game_active:
             controls += " | BAŞLAT: SPACE"
         
-        controls += " | DURAKLAT: ESC"
+        controls += " | DURAKLAT: ESC | PROFİL: P"
         print(controls)
 
+        if self.show_profiler:
+            for line in self.profiler.overlay_lines():
+                print(line)
+
     def setup_terminal(self):
         if os.name != 'nt':
             self.old_settings = termios.tcgetattr(sys.stdin)
@@ -150,6 +492,7 @@ class VerticalPongGame:
                     elif key == b' ': return 'SPACE'
                     elif key == b'a' or key == b'A': return 'A'
                     elif key == b'd' or key == b'D': return 'D'
+                    elif key == b'p' or key == b'P': return 'PROFILE'
                 return None
             else:
                 # Unix sistemler (Termux)
@@ -163,6 +506,7 @@ class VerticalPongGame:
                     elif key == ' ': return 'SPACE'
                     elif key == 'a' or key == 'A': return 'A'
                     elif key == 'd' or key == 'D': return 'D'
+                    elif key == 'p' or key == 'P': return 'PROFILE'
                 return None
         except:
             return None
@@ -212,9 +556,10 @@ class VerticalPongGame:
         # Multiplayer seçimi
         while True:
             mp_choice = self.show_menu("MOD", 
-                ["TEK OYUNCU", "MULTIPLAYER"])
-            if mp_choice in ["1", "2"]:
-                self.multiplayer = (mp_choice == "2")
+                ["TEK OYUNCU", "MULTIPLAYER", "ODA SUNUCUSU"])
+            if mp_choice in ["1", "2", "3"]:
+                self.multiplayer = (mp_choice != "1")
+                self.room_mode = (mp_choice == "3")
                 break
             else:
                 print("Geçersiz seçim! Tekrar deneyin.")
@@ -235,7 +580,20 @@ class VerticalPongGame:
                 print("Geçersiz seçim! Tekrar deneyin.")
                 time.sleep(1)
 
-        if self.multiplayer:
+        if self.room_mode:
+            while True:
+                room_choice = self.show_menu("ODA",
+                    ["MAÇA KATIL", "MAÇ İZLE"])
+                if room_choice in ["1", "2"]:
+                    self.spectate = (room_choice == "2")
+                    break
+                else:
+                    print("Geçersiz seçim! Tekrar deneyin.")
+                    time.sleep(1)
+
+            ip = input("Server IP (boş=localhost): ")
+            self.server_ip = ip if ip else "127.0.0.1"
+        elif self.multiplayer:
             while True:
                 role_choice = self.show_menu("ROL", 
                     ["SERVER", "CLIENT"])
@@ -324,70 +682,64 @@ class VerticalPongGame:
                 else:
                     self.connect_to_server()
                 
-                if self.connected:
+                if self.connected and self.room_mode:
+                    # Maç sunucuda başlar, geri sayım yok
+                    self.join_room()
+                elif self.connected:
                     self.countdown()
                 else:
                     self.multiplayer = False
+                    self.room_mode = False
                     print("Multiplayer başarısız, tek oyuncu moduna geçiliyor...")
                     time.sleep(2)
 
+            if self.trace_path:
+                self.profiler.open_trace(self.trace_path)
+
+            if self.record_path and self.room_mode:
+                # Durum sunucuda üretilir; istemci kaydı ne oynatılabilir ne karşılaştırılabilir
+                print("Oda sunucusu modunda kayıt desteklenmiyor, --record yok sayıldı.")
+                time.sleep(2)
+            elif self.record_path:
+                # Kayıt başladığında oyun ayarları kesinleşmiş olmalı
+                from pong_replay import ReplayWriter
+                self.recorder = ReplayWriter(numbered_path(self.record_path), self)
+
             self.game_active = True
             self.game_loop()
         finally:
+            self.profiler.close()
+            if self.recorder:
+                self.recorder.close(self.tick)
+                self.recorder = None
             self.restore_terminal()
 
     def update_game(self):
         if not self.game_active or self.paused:
             return
 
-        # Topu hareket ettir
-        self.ball_pos[0] += int(self.ball_vel[0] * self.ball_speed)
-        self.ball_pos[1] += int(self.ball_vel[1] * self.ball_speed)
-
-        # Sol ve sağ duvarlardan sekme
-        if self.ball_pos[0] <= 0 or self.ball_pos[0] >= self.board_width - 1:
-            self.ball_vel[0] *= -1
-
-        # Üst paddle kontrolü
-        if self.ball_pos[1] <= 0:
-            if (self.top_paddle <= self.ball_pos[0] < self.top_paddle + self.paddle_width):
-                self.ball_vel[1] = abs(self.ball_vel[1])  # Aşağı dön
-                # Topun paddle'ın neresine çarptığına göre açı değiştir
-                paddle_center = self.top_paddle + self.paddle_width // 2
-                offset = (self.ball_pos[0] - paddle_center) / (self.paddle_width // 2)
-                self.ball_vel[0] = offset * 1.5
-            else:
-                self.bottom_score += 1
-                self.miss_count += 1
-                self.reset_ball()
+        # Oda sunucusu yetkili: durum sadece S satırlarından gelir
+        if self.room_mode:
+            return
 
-        # Alt paddle kontrolü
-        elif self.ball_pos[1] >= self.board_height - 1:
-            if (self.bottom_paddle <= self.ball_pos[0] < self.bottom_paddle + self.paddle_width):
-                self.ball_vel[1] = -abs(self.ball_vel[1])  # Yukarı dön
-                # Topun paddle'ın neresine çarptığına göre açı değiştir
-                paddle_center = self.bottom_paddle + self.paddle_width // 2
-                offset = (self.ball_pos[0] - paddle_center) / (self.paddle_width // 2)
-                self.ball_vel[0] = offset * 1.5
-            else:
-                self.top_score += 1
-                self.miss_count += 1
-                self.reset_ball()
+        if self.step():
+            # Tek oyuncu modunda bilgisayarın paddle hareketi
+            if not self.multiplayer:
+                self.ai_move()
 
-        # 3 kaçırmada oyunu bitir
-        if self.miss_count >= self.max_misses:
-            self.game_over()
-            return
+        # Client'ın yerel durumu server'dan gelenle ezilir, onun özeti ağ kodunda alınır
+        if self.recorder and not (self.multiplayer and not self.is_server):
+            self.recorder.checksum(self)
 
-        # Tek oyuncu modunda bilgisayarın paddle hareketi
-        if not self.multiplayer:
-            self.ai_move()
+    def planned_stall(self, seconds):
+        # Bilerek bekleme: profil bunu yavaş kare saymaz
+        start = time.perf_counter()
+        time.sleep(seconds)
+        self.profiler.add_stall(time.perf_counter() - start)
 
     def reset_ball(self):
-        self.ball_pos = [self.board_width // 2, self.board_height // 2]
-        # Rastgele başlangıç yönü
-        self.ball_vel = [random.choice([-1, 1]) * 0.7, random.choice([-1, 1])]
-        time.sleep(0.5)
+        super().reset_ball()
+        self.planned_stall(0.5)
 
     def game_over(self):
         self.draw_board()
@@ -395,35 +747,9 @@ class VerticalPongGame:
         print(f"\nOYUN BİTTİ! {loser} TARAF KAYBETTİ")
         print(f"Son skor: {self.top_score} - {self.bottom_score}")
         print("Yeni oyun başlatılıyor...")
-        time.sleep(3)
+        self.planned_stall(3)
         
-        # Skorları sıfırla
-        self.top_score = 0
-        self.bottom_score = 0
-        self.miss_count = 0
-        self.reset_ball()
-
-    def ai_move(self):
-        # Basit AI: topun x pozisyonunu takip et
-        target_x = self.ball_pos[0] - self.paddle_width // 2
-        
-        # Zorluk seviyesine göre AI hassasiyeti
-        if self.difficulty == "KOLAY":
-            if random.random() < 0.3:  # %30 hata yapma şansı
-                target_x += random.randint(-2, 2)
-        elif self.difficulty == "ZOR":
-            # Daha iyi takip + öngörü
-            if self.ball_vel[1] > 0:  # Top aşağı iniyorsa
-                predict_x = self.ball_pos[0] + self.ball_vel[0] * 3
-                target_x = predict_x - self.paddle_width // 2
-            
-        target_x = max(0, min(self.board_width - self.paddle_width, target_x))
-        
-        # Yumuşak hareket
-        if self.top_paddle < target_x:
-            self.top_paddle += 1
-        elif self.top_paddle > target_x:
-            self.top_paddle -= 1
+        super().game_over()
 
     def handle_input(self, key):
         if key == 'ESC':
@@ -434,8 +760,17 @@ class VerticalPongGame:
             self.game_active = True
             return
 
+        if key == 'PROFILE':
+            self.show_profiler = not self.show_profiler
+            return
+
+        if self.room_mode:
+            self.send_room_input(key)
+            return
+
         # Paddle hareketleri
         paddle_speed = 1
+        old_top, old_bottom = self.top_paddle, self.bottom_paddle
         
         # Üst paddle kontrolü (Server veya tek oyuncu)
         if (self.multiplayer and self.is_server) or not self.multiplayer:
@@ -451,42 +786,136 @@ class VerticalPongGame:
             elif (key == 'RIGHT' or key == 'D') and self.bottom_paddle < self.board_width - self.paddle_width:
                 self.bottom_paddle += paddle_speed
 
+        if self.recorder:
+            if self.top_paddle != old_top:
+                self.recorder.paddle(self.tick, "TOP", self.top_paddle)
+            if self.bottom_paddle != old_bottom:
+                self.recorder.paddle(self.tick, "BOTTOM", self.bottom_paddle)
+
+    def join_room(self):
+        self.room_id = None
+        self.room_role = None
+        if self.spectate:
+            self.room_status = "ODA ARANIYOR"
+            self.send_message("WATCH")
+        else:
+            self.room_status = "RAKİP BEKLENİYOR"
+            self.send_message(f"JOIN {self.difficulty}")
+
+    def send_room_input(self, key):
+        # Paddle'ı sunucu hareket ettirir; izleyici girdi gönderemez
+        if self.room_role not in ("TOP", "BOTTOM") or not self.connected:
+            return
+        try:
+            if key in ('LEFT', 'A'):
+                self.send_message("L")
+            elif key in ('RIGHT', 'D'):
+                self.send_message("R")
+        except OSError:
+            self.connected = False
+
+    def handle_room_message(self, message):
+        command, _, payload = message.partition(" ")
+        if command == "S":
+            (self.tick, self.ball_pos[0], self.ball_pos[1], self.top_paddle, self.bottom_paddle,
+             self.top_score, self.bottom_score, self.miss_count) = (int(v) for v in payload.split(","))
+        elif command == "ROOM":
+            room_id, self.room_role, size = payload.split()
+            self.room_id = int(room_id)
+            self.board_width, self.board_height, self.paddle_width = (int(v) for v in size.split(","))
+            self.room_status = f"Oda {self.room_id} ({self.room_role})"
+        elif command == "WAIT":
+            self.room_status = "RAKİP BEKLENİYOR"
+        elif command == "OVER":
+            self.room_status = f"Oda {self.room_id} ({self.room_role}) | Son maç: {payload.replace(',', ' - ')}"
+        elif command == "END":
+            # Oda kapandıysa (rakip ayrıldı vb.) yeni maç ara
+            self.join_room()
+            self.room_status += f" | Oda kapandı: {payload}"
+        elif command == "ERR":
+            self.room_status = f"HATA: {payload}"
+
+    def send_message(self, text):
+        # Mesajlar satır sonuyla ayrılır, böylece birleşen paketler ayrıştırılabilir
+        data = (text + "\n").encode()
+        self.connection.send(data)
+        self.profiler.add_sent(len(data))
+
+    def receive_messages(self):
+        try:
+            data = self.connection.recv(4096)
+        except:
+            return []
+        if not data:
+            return []
+        self.profiler.add_received(len(data))
+        self.net_buffer += data.decode(errors="ignore")
+        *messages, self.net_buffer = self.net_buffer.split("\n")
+        return messages
+
+    def handle_message(self, message):
+        # RTT ölçümü: karşı taraf PING'i aynen PONG olarak geri yollar
+        if message.startswith("PING "):
+            self.send_message("PONG " + message[5:])
+            return
+        if message.startswith("PONG "):
+            self.profiler.add_rtt(time.perf_counter() - float(message[5:]))
+            return
+
+        if self.room_mode:
+            self.handle_room_message(message)
+        elif self.is_server:
+            # Server yetkili: geçersiz konumu alan içine sıkıştır
+            position = max(0, min(self.board_width - self.paddle_width, int(message)))
+            # Client her kare yollar; kayda sadece değişiklik yazılır
+            if self.recorder and position != self.bottom_paddle:
+                self.recorder.paddle(self.tick, "BOTTOM", position)
+            self.bottom_paddle = position
+        else:
+            parts = message.split(',')
+            if len(parts) == 7:
+                self.ball_pos[0] = int(parts[0])
+                self.ball_pos[1] = int(parts[1])
+                self.top_paddle = int(parts[2])
+                self.top_score = int(parts[3])
+                self.bottom_score = int(parts[4])
+                self.miss_count = int(parts[5])
+                self.tick = int(parts[6])
+                if self.recorder:
+                    self.recorder.checksum(self)
+
+    def receive_and_handle(self):
+        for message in self.receive_messages():
+            try:
+                self.handle_message(message)
+            except ValueError:
+                pass
+
     def network_send_receive(self):
         if not self.connection or not self.connected:
             return
 
         try:
-            if self.is_server:
+            self.connection.setblocking(False)
+            if self.room_mode:
+                # Oda sunucusu: girdiler tuşa basınca gider, burada sadece durum alınır
+                self.receive_and_handle()
+            elif self.is_server:
                 # Server: client'tan veri al, kendi verisini gönder
-                self.connection.setblocking(False)
-                try:
-                    data = self.connection.recv(1024).decode()
-                    if data:
-                        self.bottom_paddle = int(data)
-                except:
-                    pass
+                self.receive_and_handle()
                 
-                # Server durumu gönder
-                data_to_send = f"{self.ball_pos[0]},{self.ball_pos[1]},{self.top_paddle},{self.top_score},{self.bottom_score},{self.miss_count}"
-                self.connection.send(data_to_send.encode())
+                # Server durumu gönder (tik, kayıtları karşılaştırmak için)
+                self.send_message(f"{self.ball_pos[0]},{self.ball_pos[1]},{self.top_paddle},{self.top_score},{self.bottom_score},{self.miss_count},{self.tick}")
             else:
                 # Client: server'a veri gönder, server durumunu al
-                self.connection.send(str(self.bottom_paddle).encode())
-                
-                self.connection.setblocking(False)
-                try:
-                    data = self.connection.recv(1024).decode()
-                    if data:
-                        parts = data.split(',')
-                        if len(parts) == 6:
-                            self.ball_pos[0] = int(parts[0])
-                            self.ball_pos[1] = int(parts[1])
-                            self.top_paddle = int(parts[2])
-                            self.top_score = int(parts[3])
-                            self.bottom_score = int(parts[4])
-                            self.miss_count = int(parts[5])
-                except:
-                    pass
+                self.send_message(str(self.bottom_paddle))
+                self.receive_and_handle()
+
+            # Her iki taraf da kendi RTT'sini ölçer
+            now = time.perf_counter()
+            if now - self.last_ping >= PING_INTERVAL:
+                self.last_ping = now
+                self.send_message(f"PING {now!r}")
         except:
             self.connected = False
 
@@ -532,6 +961,9 @@ class VerticalPongGame:
             self.difficulty = "ZOR"
             self.ball_speed = 1.4
 
+        if self.recorder:
+            self.recorder.difficulty(self.tick, self.difficulty)
+
     def change_controls(self):
         control_choice = self.show_menu("KONTROLLER",
             ["OK TUŞLARI", "A/D TUŞLARI"])
@@ -549,6 +981,7 @@ class VerticalPongGame:
         
         if new_mp != self.multiplayer:
             self.multiplayer = new_mp
+            self.room_mode = False
             if self.multiplayer:
                 role_choice = self.show_menu("ROL", 
                     ["SERVER", "CLIENT"])
@@ -566,34 +999,62 @@ class VerticalPongGame:
 
     def game_loop(self):
         last_time = time.time()
+        profiler = self.profiler
         
         while self.game_active:
             current_time = time.time()
             delta_time = current_time - last_time
             
             # Sabit FPS (15 FPS - Termux için optimize)
-            if delta_time >= 0.066:  # ~15 FPS
+            if delta_time >= FRAME_BUDGET:  # ~15 FPS
                 last_time = current_time
                 
                 if not self.paused:
+                    profiler.begin_frame(delta_time)
+
+                    start = time.perf_counter()
                     self.update_game()
+                    profiler.record("update_game", start)
+
+                    start = time.perf_counter()
                     self.draw_board()
+                    profiler.record("draw_board", start)
                     
                     if self.multiplayer and self.connected:
+                        start = time.perf_counter()
                         self.network_send_receive()
+                        profiler.record("network_send_receive", start)
+
+                    profiler.end_frame()
+                    # Planlı bekleme sonraki karenin süresine de yansımasın
+                    last_time += profiler.stall
 
             # Girdi işleme
             key = self.get_input()
             if key:
                 self.handle_input(key)
+                if key == 'ESC':
+                    # Duraklatma menüsünde geçen süre kare süresi sayılmasın
+                    last_time = time.time()
 
             # CPU kullanımını azalt
             time.sleep(0.01)
 
 def main():
+    parser = argparse.ArgumentParser(description="Termux için dikey Pong")
+    parser.add_argument("--record", metavar="DOSYA",
+                        help="Maçları tekrar oynatılabilir biçimde kaydet; her maç DOSYA-1, DOSYA-2, ... (bkz. pong_replay.py)")
+    parser.add_argument("--seed", type=seed_value, help="Oyun RNG tohumu, 0..2^32-1 (varsayılan: rastgele)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Performans katmanını açık başlat (oyun içinde P ile aç/kapa)")
+    parser.add_argument("--trace", metavar="DOSYA",
+                        help="Kare başına süreleri JSON-lines olarak bu dosyaya ekle")
+    args = parser.parse_args()
+
     try:
         while True:
-            game = VerticalPongGame()
+            game = VerticalPongGame(seed=args.seed, record_path=args.record,
+                                    trace_path=args.trace, show_profiler=args.profile)
             game.main_menu()
     except KeyboardInterrupt:
         print("\nOyundan çıkılıyor...")
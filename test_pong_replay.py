@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# Kaydedilen maç yeniden simüle edilince aynı durum özetlerini vermeli.
+# Çalıştır: python -m pytest test_pong_replay.py  veya  python test_pong_replay.py
+
+import contextlib
+import io
+import os
+import random
+import tempfile
+import unittest
+
+from pong_replay import DIFFICULTIES, EV_DIFFICULTY, Replay, ReplayWriter, compare, simulate
+from test2 import DIFFICULTY_SPEEDS, PongCore
+
+
+class ReplayRoundTripTest(unittest.TestCase):
+    TICKS = 3000
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def record(self, name, seed=42, late_difficulty="ZOR"):
+        # Tek oyunculu maç: AI üstte, alt paddle rastgele "oyuncu" girdisi
+        path = os.path.join(self.tmp.name, name)
+        game = PongCore(6.5, "NORMAL", seed=seed)
+        writer = ReplayWriter(path, game)
+        moves = random.Random(seed)
+        for _ in range(self.TICKS):
+            if game.step():
+                game.ai_move()
+            writer.checksum(game)
+
+            if game.tick == self.TICKS // 2:
+                game.difficulty = late_difficulty
+                game.ball_speed = DIFFICULTY_SPEEDS[late_difficulty]
+                writer.difficulty(game.tick, late_difficulty)
+            if moves.random() < 0.3:
+                limit = game.board_width - game.paddle_width
+                position = max(0, min(limit, game.bottom_paddle + moves.choice([-1, 1])))
+                if position != game.bottom_paddle:
+                    game.bottom_paddle = position
+                    writer.paddle(game.tick, "BOTTOM", position)
+        writer.close(game.tick)
+        return path
+
+    def test_resimulation_is_deterministic(self):
+        replay = Replay(self.record("mac.rpl"))
+        self.assertTrue(replay.ai)
+        self.assertEqual(replay.last_tick, self.TICKS)
+
+        game = replay.new_game()
+        checked, mismatches = simulate(replay, game)
+        self.assertEqual(checked, self.TICKS // replay.checksum_interval)
+        self.assertEqual(mismatches, [])
+        self.assertEqual(game.tick, self.TICKS)
+
+    def test_tampered_event_is_detected(self):
+        replay = Replay(self.record("mac.rpl"))
+        # Zorluk olayını değiştir: top hızı değişir, durum ayrışmalı
+        for i, (tick, code, value) in enumerate(replay.events):
+            if code == EV_DIFFICULTY:
+                replay.events[i] = (tick, code, DIFFICULTIES.index("KOLAY"))
+                break
+        else:
+            self.fail("kayıtta zorluk olayı yok")
+
+        checked, mismatches = simulate(replay, replay.new_game())
+        self.assertTrue(mismatches)
+        self.assertGreater(mismatches[0], self.TICKS // 2)
+
+    def test_compare(self):
+        first = Replay(self.record("a.rpl"))
+        same = Replay(self.record("b.rpl"))
+        different = Replay(self.record("c.rpl", late_difficulty="KOLAY"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(compare(first, same), 0)
+            self.assertEqual(compare(first, different), 1)
+
+    def test_truncated_file(self):
+        path = self.record("mac.rpl")
+        full = Replay(path)
+        with open(path, "rb") as f:
+            data = f.read()
+
+        for cut in (1, 2, 3, len(data) // 2):
+            with self.subTest(cut=cut):
+                with open(path, "wb") as f:
+                    f.write(data[:-cut])
+                replay = Replay(path)
+                self.assertTrue(replay.truncated)
+                self.assertEqual(replay.events, full.events[:len(replay.events)])
+                checked, mismatches = simulate(replay, replay.new_game())
+                self.assertEqual(mismatches, [])
+
+        with open(path, "wb") as f:
+            f.write(data[:10])
+        with self.assertRaises(ValueError):
+            Replay(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# BatchPong ile SimGame (PongCore) tik tik aynı oyunu oynamalı.
+# Çalıştır: python -m pytest test_pong_sim.py  veya  python test_pong_sim.py
+
+import random
+import unittest
+from statistics import NormalDist
+
+from pong_sim import BatchPong, MatchStats, SimGame, np, run_batch
+
+
+class SharedStream:
+    # Aynı tohumdan aynı sayı dizisi; PongCore'a random.Random, BatchPong'a
+    # numpy Generator gibi görünür, böylece iki taraf aynı rastgele kararları verir
+    def __init__(self, seed):
+        self.source = random.Random(seed)
+
+    def pick(self, options):
+        return options[int(self.source.random() * len(options))]
+
+    def normal_value(self, mu, sigma):
+        # Ters dağılım fonksiyonu iki tarafta da aynı sayıyı verir
+        return mu + sigma * NormalDist().inv_cdf(max(self.source.random(), 1e-12))
+
+    # random.Random arayüzü
+    def choice(self, options, count=None):
+        if count is None:
+            return self.pick(options)
+        return np.array([self.pick(options) for _ in range(count)])
+
+    def gauss(self, mu, sigma):
+        return self.normal_value(mu, sigma)
+
+    # numpy Generator arayüzü
+    def normal(self, mu, sigma, count):
+        return np.array([self.normal_value(mu, sigma) for _ in range(count)])
+
+
+@unittest.skipIf(np is None, "numpy gerekli")
+class BatchParityTest(unittest.TestCase):
+    TICKS = 8000
+    MAX_MATCH_TICKS = 700  # Zaman aşımı yolu da denensin
+
+    def check_parity(self, difficulty, opponent, ball_speed=None, seed=1):
+        seq_stats = MatchStats(difficulty)
+        game = SimGame(6.5, difficulty, opponent, seq_stats, ball_speed)
+        game.rng = SharedStream(seed)
+
+        batch_stats = MatchStats(difficulty)
+        batch = BatchPong(1, 6.5, difficulty, opponent, ball_speed, quota=self.TICKS)
+        batch.rng = SharedStream(seed)
+        # İlk servis rastgele; karşılaştırma için çekirdeğin servisinden başla
+        batch.vel_x[0], batch.vel_y[0] = game.ball_vel
+
+        for tick in range(1, self.TICKS + 1):
+            game.play_tick(self.MAX_MATCH_TICKS)
+            batch.step(batch_stats, self.MAX_MATCH_TICKS)
+            expected = (game.ball_pos[0], game.ball_pos[1], game.ball_vel[0], game.ball_vel[1],
+                        game.top_paddle, game.bottom_paddle, game.top_score,
+                        game.bottom_score, game.miss_count, game.rally)
+            actual = (batch.ball_x[0], batch.ball_y[0], batch.vel_x[0], batch.vel_y[0],
+                      batch.top[0], batch.bottom[0], batch.top_score[0],
+                      batch.bottom_score[0], batch.miss_count[0], batch.rally[0])
+            self.assertEqual(expected, tuple(v.item() for v in actual), f"tik {tick}")
+
+        self.assertEqual(
+            (seq_stats.matches, seq_stats.ai_wins, seq_stats.timeouts, seq_stats.ticks, seq_stats.rallies),
+            (batch_stats.matches, batch_stats.ai_wins, batch_stats.timeouts, batch_stats.ticks, batch_stats.rallies))
+        return seq_stats
+
+    def test_parity(self):
+        for difficulty, opponent in (("KOLAY", "NORMAL"), ("NORMAL", "NORMAL"), ("ZOR", "KOLAY")):
+            with self.subTest(difficulty=difficulty, opponent=opponent):
+                stats = self.check_parity(difficulty, opponent)
+                self.assertGreater(stats.finished(), 0)
+
+    def test_parity_ball_speed(self):
+        self.check_parity("NORMAL", "ZOR", ball_speed=1.4, seed=7)
+
+    def test_batch_counts_exact_matches(self):
+        for lanes in (1, 3, 4, 16):
+            with self.subTest(lanes=lanes):
+                stats = run_batch("NORMAL", "NORMAL", 10, lanes, 6.5, max_match_ticks=300, seed=3)
+                self.assertEqual(stats.finished(), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()